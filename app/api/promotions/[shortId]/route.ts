@@ -1,5 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { prisma } from '@/lib/prisma';
+import { getPromotionByShortId } from '@/lib/promotionCache';
 
 export async function GET(
   request: NextRequest,
@@ -8,11 +8,7 @@ export async function GET(
   try {
     const { shortId } = await context.params;
 
-    const promotion = await prisma.promotion.findUnique({
-      where: {
-        shortId: shortId,
-      },
-    });
+    const promotion = await getPromotionByShortId(shortId);
 
     if (!promotion) {
       return NextResponse.json(
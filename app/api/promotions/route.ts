@@ -2,6 +2,8 @@ import { NextRequest, NextResponse } from 'next/server';
 import { prisma } from '@/lib/prisma';
 import { scrapeProductImage } from '@/lib/scraper';
 import { generateShortId } from '@/lib/shortId';
+import { invalidatePromotion, invalidateAllPromotions } from '@/lib/promotionCache';
+import { deletePromotionsInChunks } from '@/lib/promotionDelete';
 
 export async function POST(request: NextRequest) {
   let requestBody: any = {};
@@ -119,6 +121,7 @@ export async function POST(request: NextRequest) {
       },
     });
     console.log('Promotion created successfully:', promotion.id);
+    invalidatePromotion(promotion);
 
     return NextResponse.json({
       ...promotion,
@@ -213,28 +216,28 @@ export async function DELETE(request: NextRequest) {
       
       console.log(`Deleting promotions from ${startDate.toISOString()} to ${endDate.toISOString()}`);
       
-      const deletedCount = await prisma.promotion.deleteMany({
-        where: {
-          createdAt: {
-            gte: startDate,
-            lt: endDate
-          }
+      const deletedCount = await deletePromotionsInChunks({
+        createdAt: {
+          gte: startDate,
+          lt: endDate
         }
       });
+      invalidateAllPromotions();
       
       return NextResponse.json({ 
-        message: `Promotions deleted successfully from ${startDay}/${month}/${year} to ${endDay}/${month}/${year}. Count: ${deletedCount.count}`,
-        deletedCount: deletedCount.count,
+        message: `Promotions deleted successfully from ${startDay}/${month}/${year} to ${endDay}/${month}/${year}. Count: ${deletedCount}`,
+        deletedCount: deletedCount,
         dateRange: `${startDay}/${month}/${year} - ${endDay}/${month}/${year}`
       });
     }
 
     // Delete all promotions
     if (deleteAll === 'true') {
-      const deletedCount = await prisma.promotion.deleteMany({});
+      const deletedCount = await deletePromotionsInChunks({});
+      invalidateAllPromotions();
       return NextResponse.json({ 
-        message: `All promotions deleted successfully. Count: ${deletedCount.count}`,
-        deletedCount: deletedCount.count 
+        message: `All promotions deleted successfully. Count: ${deletedCount}`,
+        deletedCount: deletedCount 
       });
     }
 
@@ -246,6 +249,7 @@ export async function DELETE(request: NextRequest) {
     const deletedPromotion = await prisma.promotion.delete({
       where: { id }
     });
+    invalidatePromotion(deletedPromotion);
 
     return NextResponse.json({ message: 'Promotion deleted successfully', deletedPromotion });
   } catch (error) {
@@ -0,0 +1,31 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { invalidatePromotion } from '@/lib/promotionCache';
+
+// Invalida o cache das promoções alteradas fora da API (ex.: scripts/batch-optimize-images.js)
+export async function POST(request: NextRequest) {
+  try {
+    const authHeader = request.headers.get('authorization');
+    const expectedAuth = `Bearer ${process.env.API_SECRET_KEY}`;
+
+    if (!authHeader || authHeader !== expectedAuth) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+    }
+
+    const { promotions } = await request.json();
+
+    if (!Array.isArray(promotions)) {
+      return NextResponse.json({ error: 'promotions must be an array' }, { status: 400 });
+    }
+
+    for (const promotion of promotions) {
+      if (promotion?.shortId && promotion?.storeName) {
+        invalidatePromotion(promotion);
+      }
+    }
+
+    return NextResponse.json({ message: 'Cache invalidated', count: promotions.length });
+  } catch (error) {
+    console.error('Error invalidating promotion cache:', error);
+    return NextResponse.json({ error: 'Internal server error' }, { status: 500 });
+  }
+}
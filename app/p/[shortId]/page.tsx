@@ -1,4 +1,4 @@
-import { prisma } from '@/lib/prisma';
+import { getPromotionByShortId, getRelatedPromotions, getLatestPromotions } from '@/lib/promotionCache';
 import { notFound } from 'next/navigation';
 import Image from 'next/image';
 import Link from 'next/link';
@@ -17,16 +17,18 @@ export default async function ProductPage({ params }: PageProps) {
   const { shortId } = await params;
 
   try {
-    const promotion = await prisma.promotion.findUnique({
-      where: {
-        shortId: shortId,
-      },
-    });
+    const promotion = await getPromotionByShortId(shortId);
 
     if (!promotion) {
       notFound();
     }
 
+    // Listas pré-calculadas por loja (cache em memória, invalidado no POST/DELETE)
+    const [relatedPromotions, latestPromotions] = await Promise.all([
+      getRelatedPromotions(promotion.storeName, promotion.id),
+      getLatestPromotions(promotion.id),
+    ]);
+
     const formatTimeAgo = (date: Date) => {
       const now = new Date();
       const diffInMs = now.getTime() - new Date(date).getTime();
@@ -173,12 +175,13 @@ export default async function ProductPage({ params }: PageProps) {
             <RelatedProducts 
               currentProductId={promotion.id} 
               title="Você também vai gostar"
+              initialProducts={relatedPromotions}
             />
           </div>
 
           {/* More Promotions Section */}
           <div className="max-w-6xl mx-auto">
-            <MorePromotions currentProductId={promotion.id} />
+            <MorePromotions currentProductId={promotion.id} initialPromotions={latestPromotions} />
           </div>
         </main>
 
@@ -201,11 +204,7 @@ export async function generateMetadata({ params }: PageProps): Promise<Metadata>
   const { shortId } = await params;
 
   try {
-    const promotion = await prisma.promotion.findUnique({
-      where: {
-        shortId: shortId,
-      },
-    });
+    const promotion = await getPromotionByShortId(shortId);
 
     if (!promotion) {
       return {
@@ -18,11 +18,12 @@ interface Promotion {
 
 interface MorePromotionsProps {
   currentProductId: string;
+  initialPromotions?: Promotion[];
 }
 
-export default function MorePromotions({ currentProductId }: MorePromotionsProps) {
-  const [promotions, setPromotions] = useState<Promotion[]>([]);
-  const [loading, setLoading] = useState(true);
+export default function MorePromotions({ currentProductId, initialPromotions }: MorePromotionsProps) {
+  const [promotions, setPromotions] = useState<Promotion[]>(initialPromotions ?? []);
+  const [loading, setLoading] = useState(!initialPromotions);
   const [page, setPage] = useState(1);
   const [hasMore, setHasMore] = useState(true);
 
@@ -49,8 +50,16 @@ export default function MorePromotions({ currentProductId }: MorePromotionsProps
   };
 
   useEffect(() => {
+    // Primeira página já veio pré-calculada do servidor
+    if (initialPromotions) {
+      setPromotions(initialPromotions);
+      setPage(1);
+      setHasMore(true);
+      setLoading(false);
+      return;
+    }
     fetchPromotions(1);
-  }, [currentProductId]);
+  }, [currentProductId, initialPromotions]);
 
   const loadMore = () => {
     if (!loading && hasMore) {
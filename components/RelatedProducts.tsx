@@ -21,13 +21,21 @@ interface Promotion {
 interface RelatedProductsProps {
   currentProductId: string;
   title: string;
+  initialProducts?: Promotion[];
 }
 
-export default function RelatedProducts({ currentProductId, title }: RelatedProductsProps) {
-  const [products, setProducts] = useState<Promotion[]>([]);
-  const [loading, setLoading] = useState(true);
+export default function RelatedProducts({ currentProductId, title, initialProducts }: RelatedProductsProps) {
+  const [products, setProducts] = useState<Promotion[]>(initialProducts ?? []);
+  const [loading, setLoading] = useState(!initialProducts);
 
   useEffect(() => {
+    // Produtos já vieram pré-calculados do servidor
+    if (initialProducts) {
+      setProducts(initialProducts);
+      setLoading(false);
+      return;
+    }
+
     const fetchRelatedProducts = async () => {
       try {
         const response = await fetch(`/api/promotions?limit=20`);
@@ -48,7 +56,7 @@ export default function RelatedProducts({ currentProductId, title }: RelatedProd
     };
 
     fetchRelatedProducts();
-  }, [currentProductId]);
+  }, [currentProductId, initialProducts]);
 
   const formatTimeAgo = (date: Date) => {
     const now = new Date();
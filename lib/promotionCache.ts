@@ -0,0 +1,100 @@
+import type { Promotion } from '@prisma/client';
+import { unstable_cache, revalidateTag } from 'next/cache';
+import { prisma } from '@/lib/prisma';
+
+// Promoções não mudam depois de criadas, então a página /p/[shortId] e as
+// listas de relacionados ficam no Data Cache do Next (compartilhado entre as
+// instâncias na Vercel) até um POST/DELETE invalidar as tags, com TTL de segurança.
+
+const CACHE_TTL_SECONDS = 60 * 60; // 1 hora
+const LIST_SIZE = 20; // mesmo tamanho da página da API, para a paginação bater
+const ALL_STORES_KEY = '__all__';
+const PROMOTIONS_TAG = 'promotions';
+
+export interface PromotionListItem {
+  id: string;
+  shortId: string;
+  title: string;
+  price: string;
+  price_from?: string;
+  storeName: string;
+  affiliateLink: string;
+  imageUrl: string;
+  coupon?: string;
+  createdAt: Date;
+}
+
+const promotionTag = (shortId: string) => `promotion:${shortId}`;
+const storeListTag = (storeName: string) => `promotions:store:${storeName}`;
+
+function toListItem(promotion: Promotion): PromotionListItem {
+  return {
+    id: promotion.id,
+    shortId: promotion.shortId,
+    title: promotion.title,
+    price: promotion.price,
+    price_from: promotion.price_from ?? undefined,
+    storeName: promotion.storeName,
+    affiliateLink: promotion.affiliateLink,
+    imageUrl: promotion.imageUrl,
+    coupon: promotion.coupon ?? undefined,
+    createdAt: promotion.createdAt,
+  };
+}
+
+// O Data Cache serializa em JSON, então as datas voltam como string
+function reviveDates<T extends { createdAt: Date }>(item: T): T {
+  return { ...item, createdAt: new Date(item.createdAt) };
+}
+
+export async function getPromotionByShortId(shortId: string): Promise<Promotion | null> {
+  const promotion = await unstable_cache(
+    () => prisma.promotion.findUnique({ where: { shortId } }),
+    ['promotion', shortId],
+    { tags: [PROMOTIONS_TAG, promotionTag(shortId)], revalidate: CACHE_TTL_SECONDS }
+  )();
+
+  return promotion ? reviveDates(promotion) : null;
+}
+
+async function getPromotionList(storeName?: string): Promise<PromotionListItem[]> {
+  const key = storeName ?? ALL_STORES_KEY;
+
+  const list = await unstable_cache(
+    async () => {
+      const promotions = await prisma.promotion.findMany({
+        where: storeName ? { storeName } : undefined,
+        take: LIST_SIZE,
+        orderBy: {
+          createdAt: 'desc',
+        },
+      });
+      return promotions.map(toListItem);
+    },
+    ['promotion-list', key],
+    { tags: [PROMOTIONS_TAG, storeListTag(key)], revalidate: CACHE_TTL_SECONDS }
+  )();
+
+  return list.map(reviveDates);
+}
+
+export async function getRelatedPromotions(storeName: string, excludeId: string, limit = 10): Promise<PromotionListItem[]> {
+  const list = await getPromotionList(storeName);
+  return list.filter((promotion) => promotion.id !== excludeId).slice(0, limit);
+}
+
+export async function getLatestPromotions(excludeId: string): Promise<PromotionListItem[]> {
+  const list = await getPromotionList();
+  return list.filter((promotion) => promotion.id !== excludeId);
+}
+
+// Chamado após criar/excluir uma promoção: invalida a página e as listas da loja
+export function invalidatePromotion(promotion: { shortId: string; storeName: string }): void {
+  revalidateTag(promotionTag(promotion.shortId));
+  revalidateTag(storeListTag(promotion.storeName));
+  revalidateTag(storeListTag(ALL_STORES_KEY));
+}
+
+export function invalidateAllPromotions(): void {
+  revalidateTag(PROMOTIONS_TAG);
+}
@@ -0,0 +1,71 @@
+import type { Prisma } from '@prisma/client';
+import { prisma } from '@/lib/prisma';
+
+const DELETE_CHUNK_SIZE = 500;
+// Uma promoção pode ter milhares de views/clicks: os eventos têm o próprio lote
+const EVENT_DELETE_CHUNK_SIZE = 1000;
+
+type EventKey = { id: string; timestamp: Date };
+
+/**
+ * Exclui eventos (views ou clicks) em lotes de no máximo EVENT_DELETE_CHUNK_SIZE
+ * linhas, pela chave completa (id, timestamp), para nenhum DELETE ficar sem limite
+ */
+async function deleteEventsInChunks(
+  findChunk: (take: number) => Promise<EventKey[]>,
+  deleteChunk: (keys: EventKey[]) => Promise<{ count: number }>
+): Promise<number> {
+  let deletedCount = 0;
+
+  while (true) {
+    const keys = await findChunk(EVENT_DELETE_CHUNK_SIZE);
+    if (keys.length === 0) break;
+
+    const result = await deleteChunk(keys);
+    if (result.count === 0) break;
+
+    deletedCount += result.count;
+  }
+
+  return deletedCount;
+}
+
+/**
+ * Exclui promoções em lotes limitados
+ * Evita uma única transação gigante (e o cascade em views/clicks) travando as tabelas
+ */
+export async function deletePromotionsInChunks(
+  where: Prisma.PromotionWhereInput,
+  chunkSize: number = DELETE_CHUNK_SIZE
+): Promise<number> {
+  let deletedCount = 0;
+
+  while (true) {
+    const chunk = await prisma.promotion.findMany({
+      where,
+      select: { id: true },
+      take: chunkSize,
+    });
+
+    if (chunk.length === 0) break;
+
+    const ids = chunk.map((promotion) => promotion.id);
+
+    // Eventos primeiro, em lotes próprios, para o cascade não ter trabalho
+    await deleteEventsInChunks(
+      (take) => prisma.promotionView.findMany({ where: { promotionId: { in: ids } }, select: { id: true, timestamp: true }, take }),
+      (keys) => prisma.promotionView.deleteMany({ where: { OR: keys } })
+    );
+    await deleteEventsInChunks(
+      (take) => prisma.promotionClick.findMany({ where: { promotionId: { in: ids } }, select: { id: true, timestamp: true }, take }),
+      (keys) => prisma.promotionClick.deleteMany({ where: { OR: keys } })
+    );
+    const result = await prisma.promotion.deleteMany({ where: { id: { in: ids } } });
+    if (result.count === 0) break;
+
+    deletedCount += result.count;
+    console.log(`Deleted chunk of ${result.count} promotions (total: ${deletedCount})`);
+  }
+
+  return deletedCount;
+}
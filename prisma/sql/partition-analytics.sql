@@ -0,0 +1,174 @@
+-- ==============================================================================
+-- Particionamento mensal das tabelas de eventos (PromotionView, PromotionClick, Analytics)
+--
+-- O Prisma não cria tabelas particionadas, então esta conversão é feita uma vez,
+-- manualmente, no Postgres de produção:
+--   psql "$DATABASE_URL" -f prisma/sql/partition-analytics.sql
+--
+-- Ordem de rollout:
+--   1. Rodar este arquivo no banco (antes de qualquer deploy do schema novo).
+--   2. Fazer o deploy. O build não roda mais `prisma db push` (só `prisma generate`),
+--      então o deploy nunca altera estas tabelas.
+--   3. Mudanças futuras de schema: rodar `npm run db:diff` e aplicar só o SQL
+--      listado para os outros modelos. Não rodar `npm run db:push` contra o banco
+--      convertido: o Prisma não modela as partições e tentaria recriar as tabelas.
+--
+-- Depois disso, scripts/analytics-retention.js cria as partições dos próximos
+-- meses e arquiva/remove partições antigas inteiras (sem DELETE linha a linha).
+-- A chave primária passa a ser (id, timestamp), como exige o Postgres para
+-- tabelas particionadas; o schema.prisma reflete isso com @@id([id, timestamp]).
+-- ==============================================================================
+
+BEGIN;
+
+-- Cria (se não existir) a partição mensal de uma tabela para o mês de month_start.
+-- Linhas desse mês que tenham caído na partição DEFAULT (ex.: o job de retenção
+-- ficou parado) são movidas para a nova partição antes do ATTACH, na mesma
+-- transação; sem isso o Postgres recusa criar a partição.
+CREATE OR REPLACE FUNCTION create_monthly_partition(parent TEXT, month_start DATE) RETURNS VOID AS $$
+DECLARE
+  start_date DATE := date_trunc('month', month_start)::date;
+  end_date DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::date;
+  partition_name TEXT := format('%s_y%sm%s', parent, to_char(start_date, 'YYYY'), to_char(start_date, 'MM'));
+  default_name TEXT := parent || '_default';
+BEGIN
+  IF to_regclass(quote_ident(partition_name)) IS NOT NULL THEN
+    RETURN;
+  END IF;
+
+  EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name, parent);
+
+  IF to_regclass(quote_ident(default_name)) IS NOT NULL THEN
+    EXECUTE format(
+      'WITH moved AS (DELETE FROM %I WHERE "timestamp" >= %L AND "timestamp" < %L RETURNING *) '
+      'INSERT INTO %I SELECT * FROM moved',
+      default_name, start_date, end_date, partition_name
+    );
+  END IF;
+
+  EXECUTE format(
+    'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+    parent, partition_name, start_date, end_date
+  );
+END;
+$$ LANGUAGE plpgsql;
+
+-- ------------------------------------------------------------------------------
+-- PromotionView
+-- ------------------------------------------------------------------------------
+ALTER TABLE "PromotionView" RENAME TO "PromotionView_old";
+ALTER TABLE "PromotionView_old" RENAME CONSTRAINT "PromotionView_pkey" TO "PromotionView_old_pkey";
+ALTER TABLE "PromotionView_old" RENAME CONSTRAINT "PromotionView_promotionId_fkey" TO "PromotionView_old_promotionId_fkey";
+ALTER INDEX "PromotionView_promotionId_idx" RENAME TO "PromotionView_old_promotionId_idx";
+ALTER INDEX "PromotionView_timestamp_idx" RENAME TO "PromotionView_old_timestamp_idx";
+
+CREATE TABLE "PromotionView" (
+  "id" TEXT NOT NULL,
+  "promotionId" TEXT NOT NULL,
+  "timestamp" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  "userAgent" TEXT,
+  "referrer" TEXT,
+  "country" TEXT,
+  "device" TEXT,
+  "viewType" TEXT,
+  CONSTRAINT "PromotionView_pkey" PRIMARY KEY ("id", "timestamp"),
+  CONSTRAINT "PromotionView_promotionId_fkey" FOREIGN KEY ("promotionId")
+    REFERENCES "Promotion"("id") ON DELETE CASCADE ON UPDATE CASCADE
+) PARTITION BY RANGE ("timestamp");
+
+CREATE INDEX "PromotionView_promotionId_idx" ON "PromotionView"("promotionId");
+CREATE INDEX "PromotionView_timestamp_idx" ON "PromotionView"("timestamp");
+CREATE TABLE "PromotionView_default" PARTITION OF "PromotionView" DEFAULT;
+
+-- ------------------------------------------------------------------------------
+-- PromotionClick
+-- ------------------------------------------------------------------------------
+ALTER TABLE "PromotionClick" RENAME TO "PromotionClick_old";
+ALTER TABLE "PromotionClick_old" RENAME CONSTRAINT "PromotionClick_pkey" TO "PromotionClick_old_pkey";
+ALTER TABLE "PromotionClick_old" RENAME CONSTRAINT "PromotionClick_promotionId_fkey" TO "PromotionClick_old_promotionId_fkey";
+ALTER INDEX "PromotionClick_promotionId_idx" RENAME TO "PromotionClick_old_promotionId_idx";
+ALTER INDEX "PromotionClick_timestamp_idx" RENAME TO "PromotionClick_old_timestamp_idx";
+
+CREATE TABLE "PromotionClick" (
+  "id" TEXT NOT NULL,
+  "promotionId" TEXT NOT NULL,
+  "timestamp" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  "userAgent" TEXT,
+  "referrer" TEXT,
+  "country" TEXT,
+  "device" TEXT,
+  "buttonType" TEXT,
+  CONSTRAINT "PromotionClick_pkey" PRIMARY KEY ("id", "timestamp"),
+  CONSTRAINT "PromotionClick_promotionId_fkey" FOREIGN KEY ("promotionId")
+    REFERENCES "Promotion"("id") ON DELETE CASCADE ON UPDATE CASCADE
+) PARTITION BY RANGE ("timestamp");
+
+CREATE INDEX "PromotionClick_promotionId_idx" ON "PromotionClick"("promotionId");
+CREATE INDEX "PromotionClick_timestamp_idx" ON "PromotionClick"("timestamp");
+CREATE TABLE "PromotionClick_default" PARTITION OF "PromotionClick" DEFAULT;
+
+-- ------------------------------------------------------------------------------
+-- Analytics
+-- ------------------------------------------------------------------------------
+ALTER TABLE "Analytics" RENAME TO "Analytics_old";
+ALTER TABLE "Analytics_old" RENAME CONSTRAINT "Analytics_pkey" TO "Analytics_old_pkey";
+ALTER INDEX "Analytics_page_idx" RENAME TO "Analytics_old_page_idx";
+ALTER INDEX "Analytics_timestamp_idx" RENAME TO "Analytics_old_timestamp_idx";
+ALTER INDEX "Analytics_sessionId_idx" RENAME TO "Analytics_old_sessionId_idx";
+
+CREATE TABLE "Analytics" (
+  "id" TEXT NOT NULL,
+  "page" TEXT NOT NULL,
+  "userAgent" TEXT,
+  "referrer" TEXT,
+  "country" TEXT,
+  "city" TEXT,
+  "device" TEXT,
+  "timestamp" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  "sessionId" TEXT,
+  "duration" INTEGER,
+  CONSTRAINT "Analytics_pkey" PRIMARY KEY ("id", "timestamp")
+) PARTITION BY RANGE ("timestamp");
+
+CREATE INDEX "Analytics_page_idx" ON "Analytics"("page");
+CREATE INDEX "Analytics_timestamp_idx" ON "Analytics"("timestamp");
+CREATE INDEX "Analytics_sessionId_idx" ON "Analytics"("sessionId");
+CREATE TABLE "Analytics_default" PARTITION OF "Analytics" DEFAULT;
+
+-- ------------------------------------------------------------------------------
+-- Partições mensais para os dados existentes + 3 meses à frente, cópia e limpeza
+-- ------------------------------------------------------------------------------
+DO $$
+DECLARE
+  migration RECORD;
+  first_month DATE;
+  month_start DATE;
+BEGIN
+  -- Colunas listadas explicitamente: a ordem física das tabelas antigas pode
+  -- diferir (o db push acrescenta colunas novas no fim)
+  FOR migration IN
+    SELECT * FROM (VALUES
+      ('PromotionView', '"id", "promotionId", "timestamp", "userAgent", "referrer", "country", "device", "viewType"'),
+      ('PromotionClick', '"id", "promotionId", "timestamp", "userAgent", "referrer", "country", "device", "buttonType"'),
+      ('Analytics', '"id", "page", "userAgent", "referrer", "country", "city", "device", "timestamp", "sessionId", "duration"')
+    ) AS t(parent, columns)
+  LOOP
+    EXECUTE format('SELECT date_trunc(''month'', COALESCE(MIN("timestamp"), now()))::date FROM %I', migration.parent || '_old')
+      INTO first_month;
+
+    FOR month_start IN
+      SELECT generate_series(first_month, date_trunc('month', now()) + INTERVAL '3 months', INTERVAL '1 month')::date
+    LOOP
+      PERFORM create_monthly_partition(migration.parent, month_start);
+    END LOOP;
+
+    EXECUTE format(
+      'INSERT INTO %I (%s) SELECT %s FROM %I',
+      migration.parent, migration.columns, migration.columns, migration.parent || '_old'
+    );
+    EXECUTE format('DROP TABLE %I', migration.parent || '_old');
+  END LOOP;
+END;
+$$;
+
+COMMIT;
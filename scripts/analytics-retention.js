@@ -0,0 +1,177 @@
+const { PrismaClient } = require('@prisma/client');
+const path = require('path');
+const fs = require('fs');
+const zlib = require('zlib');
+const { once } = require('events');
+
+// Job de retenção das tabelas de eventos particionadas por mês
+// (ver prisma/sql/partition-analytics.sql).
+//
+// Uso:
+//   node scripts/analytics-retention.js              -> arquiva e remove partições antigas
+//   node scripts/analytics-retention.js --dry-run    -> só mostra o que seria feito
+//   node scripts/analytics-retention.js --no-archive -> remove sem gerar arquivo
+//
+// Variáveis de ambiente:
+//   ANALYTICS_RETENTION_MONTHS (padrão 6) e ANALYTICS_ARCHIVE_DIR (padrão ./archives/analytics)
+
+const prisma = new PrismaClient();
+
+const PARTITIONED_TABLES = ['PromotionView', 'PromotionClick', 'Analytics'];
+const RETENTION_MONTHS = parseInt(process.env.ANALYTICS_RETENTION_MONTHS || '6', 10);
+const MONTHS_AHEAD = 3;
+const ARCHIVE_DIR = process.env.ANALYTICS_ARCHIVE_DIR || path.join(process.cwd(), 'archives', 'analytics');
+const ARCHIVE_BATCH_SIZE = 5000;
+const PARTITION_NAME_PATTERN = /^(PromotionView|PromotionClick|Analytics)_y(\d{4})m(\d{2})$/;
+
+function monthStart(year, monthIndex) {
+  return new Date(Date.UTC(year, monthIndex, 1));
+}
+
+async function ensureUpcomingPartitions(table, dryRun) {
+  const now = new Date();
+  for (let i = 0; i <= MONTHS_AHEAD; i++) {
+    const month = monthStart(now.getUTCFullYear(), now.getUTCMonth() + i);
+    const monthLabel = month.toISOString().slice(0, 10);
+    if (dryRun) {
+      console.log(`[dry-run] Would ensure partition ${table} for ${monthLabel}`);
+      continue;
+    }
+    await prisma.$executeRaw`SELECT create_monthly_partition(${table}, ${monthLabel}::date)`;
+  }
+}
+
+// Linhas na partição DEFAULT (job parado por mais de MONTHS_AHEAD meses) são
+// movidas para a partição do mês delas; create_monthly_partition faz a mudança
+// antes do ATTACH. Se sobrar algo, falha em vez de seguir com dados sem retenção.
+async function drainDefaultPartition(table, dryRun) {
+  const defaultName = `${table}_default`;
+  const months = await prisma.$queryRawUnsafe(
+    `SELECT DISTINCT to_char(date_trunc('month', "timestamp"), 'YYYY-MM-DD') AS month FROM "${defaultName}"`
+  );
+
+  for (const { month } of months) {
+    if (dryRun) {
+      console.log(`[dry-run] Would move ${defaultName} rows of ${month} into a monthly partition`);
+      continue;
+    }
+    await prisma.$executeRaw`SELECT create_monthly_partition(${table}, ${month}::date)`;
+    console.log(`📥 Moved ${defaultName} rows of ${month} into a monthly partition`);
+  }
+
+  if (dryRun) return;
+
+  const remaining = await prisma.$queryRawUnsafe(`SELECT count(*)::int AS count FROM "${defaultName}"`);
+  if (remaining[0].count > 0) {
+    throw new Error(`${defaultName} still has ${remaining[0].count} rows after moving them to monthly partitions`);
+  }
+}
+
+async function listMonthlyPartitions(table) {
+  const rows = await prisma.$queryRaw`
+    SELECT child.relname AS name
+    FROM pg_inherits
+    JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+    JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+    WHERE parent.relname = ${table}
+  `;
+
+  return rows
+    .map((row) => {
+      const match = PARTITION_NAME_PATTERN.exec(row.name);
+      if (!match) return null; // ignora a partição DEFAULT
+      return {
+        name: row.name,
+        month: monthStart(parseInt(match[2], 10), parseInt(match[3], 10) - 1),
+      };
+    })
+    .filter(Boolean)
+    .sort((a, b) => a.month - b.month);
+}
+
+// Exporta a partição para JSON Lines comprimido, em lotes paginados por id
+async function archivePartition(partitionName) {
+  if (!fs.existsSync(ARCHIVE_DIR)) {
+    fs.mkdirSync(ARCHIVE_DIR, { recursive: true });
+  }
+
+  const archivePath = path.join(ARCHIVE_DIR, `${partitionName}.jsonl.gz`);
+  const gzip = zlib.createGzip();
+  const output = fs.createWriteStream(archivePath);
+  gzip.pipe(output);
+
+  let lastId = '';
+  let total = 0;
+
+  while (true) {
+    // partitionName já foi validado por PARTITION_NAME_PATTERN
+    const rows = await prisma.$queryRawUnsafe(
+      `SELECT * FROM "${partitionName}" WHERE "id" > $1 ORDER BY "id" LIMIT ${ARCHIVE_BATCH_SIZE}`,
+      lastId
+    );
+    if (rows.length === 0) break;
+
+    for (const row of rows) {
+      if (!gzip.write(JSON.stringify(row) + '\n')) {
+        await once(gzip, 'drain');
+      }
+    }
+    total += rows.length;
+    lastId = rows[rows.length - 1].id;
+  }
+
+  gzip.end();
+  await once(output, 'finish');
+  return { archivePath, total };
+}
+
+async function dropPartition(table, partitionName) {
+  await prisma.$executeRawUnsafe(`ALTER TABLE "${table}" DETACH PARTITION "${partitionName}"`);
+  await prisma.$executeRawUnsafe(`DROP TABLE "${partitionName}"`);
+}
+
+async function main() {
+  const dryRun = process.argv.includes('--dry-run');
+  const archive = !process.argv.includes('--no-archive');
+
+  try {
+    const now = new Date();
+    const cutoff = monthStart(now.getUTCFullYear(), now.getUTCMonth() - RETENTION_MONTHS);
+    console.log(`🗄️ Analytics retention: keeping ${RETENTION_MONTHS} months (cutoff ${cutoff.toISOString().slice(0, 10)})`);
+
+    for (const table of PARTITIONED_TABLES) {
+      await drainDefaultPartition(table, dryRun);
+      await ensureUpcomingPartitions(table, dryRun);
+
+      const expired = (await listMonthlyPartitions(table)).filter((partition) => partition.month < cutoff);
+      if (expired.length === 0) {
+        console.log(`${table}: nothing to remove`);
+        continue;
+      }
+
+      for (const partition of expired) {
+        if (dryRun) {
+          console.log(`[dry-run] Would ${archive ? 'archive and ' : ''}drop ${partition.name}`);
+          continue;
+        }
+
+        if (archive) {
+          const { archivePath, total } = await archivePartition(partition.name);
+          console.log(`📦 Archived ${total} rows from ${partition.name} to ${archivePath}`);
+        }
+
+        await dropPartition(table, partition.name);
+        console.log(`✅ Dropped partition ${partition.name}`);
+      }
+    }
+  } catch (error) {
+    console.error('Erro na retenção de analytics:', error);
+    process.exitCode = 1;
+  } finally {
+    await prisma.$disconnect();
+  }
+}
+
+if (require.main === module) {
+  main();
+}
@@ -0,0 +1,400 @@
+const { Worker, isMainThread, parentPort } = require('worker_threads');
+const sharp = require('sharp');
+const crypto = require('crypto');
+const path = require('path');
+const os = require('os');
+const fs = require('fs/promises');
+const { existsSync } = require('fs');
+
+// Otimiza as imagens das promoções (substitui o antigo optimize-existing-images.js).
+// Baixa a imagem original de cada promoção, gera as variantes em um pool de
+// workers e grava em public/images/products/ com os nomes que o app já usa:
+//   {shortId}.webp -> card do site (600x600), salvo no imageUrl da promoção
+//   {shortId}.jpg  -> preview do WhatsApp (1200x630), mesmo formato de lib/imageOptimizer.ts
+//
+// Depois de atualizar o imageUrl no banco, chama POST /api/revalidate (com
+// API_SECRET_KEY) para as páginas e listas em cache não ficarem com a URL antiga.
+//
+// Uso:
+//   node scripts/batch-optimize-images.js                 -> reprocessa só imagens cujo conteúdo mudou
+//   node scripts/batch-optimize-images.js --incremental   -> só promoções criadas desde a última execução
+//   node scripts/batch-optimize-images.js --force         -> reprocessa tudo
+//   node scripts/batch-optimize-images.js --workers=4     -> define o tamanho do pool (padrão: nº de núcleos)
+
+const OUTPUT_DIR = path.join(process.cwd(), 'public', 'images', 'products');
+// Fora de public/: o manifesto lista as URLs originais e não deve ser servido nem commitado
+const MANIFEST_PATH = path.join(__dirname, '.optimize-manifest.json');
+const PUBLIC_BASE_URL = 'https://www.farejai.shop';
+// Site cujo cache (lib/promotionCache.ts) é invalidado após atualizar o imageUrl
+const REVALIDATE_BASE_URL = process.env.REVALIDATE_BASE_URL || PUBLIC_BASE_URL;
+const MAX_FILE_SIZE = 300 * 1024; // 300KB
+const USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36';
+
+// Variantes geradas a partir de uma única decodificação da imagem original
+const VARIANTS = {
+  // Preview do WhatsApp (1.91:1, JPEG para melhor compatibilidade)
+  whatsapp: {
+    extension: '.jpg',
+    width: 1200,
+    height: 630,
+    resize: { fit: 'contain', background: { r: 255, g: 255, b: 255, alpha: 1 } },
+    encode: (pipeline, quality) => pipeline.flatten({ background: '#ffffff' }).jpeg({ quality, progressive: true, mozjpeg: true }),
+  },
+  // Card do site (quadrado, WebP)
+  web: {
+    extension: '.webp',
+    width: 600,
+    height: 600,
+    resize: { fit: 'cover', position: 'center' },
+    encode: (pipeline, quality) => pipeline.webp({ quality, effort: 6 }),
+  },
+};
+
+function outputFilesFor(shortId) {
+  return Object.fromEntries(
+    Object.entries(VARIANTS).map(([name, variant]) => [name, `${shortId}${variant.extension}`])
+  );
+}
+
+// ==============================================================================
+// --- WORKER ---
+// ==============================================================================
+async function downloadImage(imageUrl) {
+  const response = await fetch(imageUrl, { headers: { 'User-Agent': USER_AGENT } });
+  if (!response.ok) {
+    throw new Error(`Failed to download image: ${response.status} ${response.statusText}`);
+  }
+  return Buffer.from(await response.arrayBuffer());
+}
+
+async function renderVariant(raw, info, variant) {
+  let quality = 85;
+  let buffer;
+  do {
+    const pipeline = sharp(raw, { raw: info }).resize(variant.width, variant.height, variant.resize);
+    buffer = await variant.encode(pipeline, quality).toBuffer();
+    quality -= 10;
+  } while (buffer.length > MAX_FILE_SIZE && quality >= 50);
+  return buffer;
+}
+
+async function optimizePromotionImage({ shortId, sourceUrl, knownHash, force }) {
+  const startedAt = Date.now();
+  const source = await downloadImage(sourceUrl);
+  const hash = crypto.createHash('sha256').update(source).digest('hex');
+  const files = outputFilesFor(shortId);
+
+  // Conteúdo igual ao da última execução e saídas presentes: nada a fazer
+  const outputsPresent = Object.values(files).every((file) => existsSync(path.join(OUTPUT_DIR, file)));
+  if (!force && knownHash === hash && outputsPresent) {
+    return { shortId, sourceUrl, hash, unchanged: true };
+  }
+
+  // Decodificar uma única vez para pixels crus e reaproveitar em todas as variantes
+  const { data, info } = await sharp(source).raw().toBuffer({ resolveWithObject: true });
+  const rawInfo = { width: info.width, height: info.height, channels: info.channels };
+
+  const outputs = {};
+  for (const [name, variant] of Object.entries(VARIANTS)) {
+    const buffer = await renderVariant(data, rawInfo, variant);
+    await fs.writeFile(path.join(OUTPUT_DIR, files[name]), buffer);
+    outputs[name] = { file: files[name], bytes: buffer.length };
+  }
+
+  return {
+    shortId,
+    sourceUrl,
+    hash,
+    sourceBytes: source.length,
+    outputs,
+    durationMs: Date.now() - startedAt,
+  };
+}
+
+if (!isMainThread) {
+  // Cada worker usa uma thread do libvips; o paralelismo vem do pool
+  sharp.concurrency(1);
+
+  parentPort.on('message', async (job) => {
+    try {
+      const result = await optimizePromotionImage(job);
+      parentPort.postMessage({ success: true, result });
+    } catch (error) {
+      parentPort.postMessage({ success: false, shortId: job.shortId, error: error.message });
+    }
+  });
+}
+
+// ==============================================================================
+// --- MAIN THREAD ---
+// ==============================================================================
+function parseArgs(argv) {
+  const options = {
+    incremental: argv.includes('--incremental'),
+    force: argv.includes('--force'),
+    workers: os.cpus().length,
+  };
+  const workersArg = argv.find((arg) => arg.startsWith('--workers='));
+  if (workersArg) {
+    const workers = parseInt(workersArg.split('=')[1], 10);
+    if (workers > 0) options.workers = workers;
+  }
+  return options;
+}
+
+async function loadManifest() {
+  try {
+    return JSON.parse(await fs.readFile(MANIFEST_PATH, 'utf-8'));
+  } catch {
+    return { images: {} };
+  }
+}
+
+async function saveManifest(manifest) {
+  const tempPath = `${MANIFEST_PATH}.tmp`;
+  await fs.writeFile(tempPath, JSON.stringify(manifest, null, 2));
+  await fs.rename(tempPath, MANIFEST_PATH);
+}
+
+function isLocalImage(imageUrl) {
+  return imageUrl.startsWith('data:') || imageUrl.includes('/images/products/');
+}
+
+async function collectJobs(prisma, manifest, options) {
+  const where = options.incremental && manifest.lastRunAt
+    ? { createdAt: { gt: new Date(manifest.lastRunAt) } }
+    : {};
+
+  const promotions = await prisma.promotion.findMany({
+    where,
+    select: { id: true, shortId: true, storeName: true, imageUrl: true },
+    orderBy: { createdAt: 'desc' },
+  });
+
+  const jobs = [];
+  const alreadyOptimized = [];
+  let skipped = 0;
+
+  for (const promotion of promotions) {
+    const known = manifest.images[promotion.shortId];
+
+    if (!isLocalImage(promotion.imageUrl)) {
+      // Imagem já gerada por um pipeline anterior (imageProcessor/optimize-existing-images):
+      // só aponta o banco para ela, sem recomprimir
+      const existingWebp = path.join(OUTPUT_DIR, outputFilesFor(promotion.shortId).web);
+      if (!known && !options.force && existsSync(existingWebp)) {
+        alreadyOptimized.push(promotion);
+        continue;
+      }
+      jobs.push({ id: promotion.id, shortId: promotion.shortId, storeName: promotion.storeName, sourceUrl: promotion.imageUrl, knownHash: known?.hash, force: options.force });
+    } else if (known && !options.incremental) {
+      // Já otimizada por este script: rebaixa a original e compara o hash
+      jobs.push({ id: promotion.id, shortId: promotion.shortId, storeName: promotion.storeName, sourceUrl: known.sourceUrl, knownHash: known.hash, force: options.force });
+    } else {
+      skipped++;
+    }
+  }
+
+  return { jobs, alreadyOptimized, skipped };
+}
+
+// Pool de workers; um worker que cai conta o job atual como erro e é substituído
+function runPool(jobs, workerCount, onResult) {
+  return new Promise((resolve) => {
+    if (jobs.length === 0) {
+      resolve();
+      return;
+    }
+
+    const queue = [...jobs];
+    const active = new Set();
+    let pending = jobs.length;
+    let finished = false;
+
+    const finish = () => {
+      finished = true;
+      Promise.all([...active].map((worker) => worker.terminate())).then(() => resolve());
+    };
+
+    const complete = (message) => {
+      onResult(message);
+      pending--;
+      if (pending === 0) finish();
+    };
+
+    const spawn = () => {
+      const worker = new Worker(__filename);
+      let current = null;
+      active.add(worker);
+
+      const next = () => {
+        current = queue.shift() || null;
+        if (current) worker.postMessage(current);
+      };
+
+      worker.on('message', (message) => {
+        current = null;
+        complete(message);
+        if (!finished) next();
+      });
+
+      worker.on('error', (error) => {
+        if (current) {
+          const job = current;
+          current = null;
+          complete({ success: false, shortId: job.shortId, error: `Worker crashed: ${error.message}` });
+        }
+      });
+
+      worker.on('exit', (code) => {
+        active.delete(worker);
+        if (finished) return;
+        if (current) {
+          const job = current;
+          current = null;
+          complete({ success: false, shortId: job.shortId, error: `Worker exited with code ${code}` });
+        }
+        if (!finished && queue.length > 0) spawn();
+      });
+
+      next();
+    };
+
+    for (let i = 0; i < Math.min(workerCount, jobs.length); i++) {
+      spawn();
+    }
+  });
+}
+
+// Invalida as tags do cache das promoções cujo imageUrl mudou
+async function revalidatePromotions(promotions) {
+  if (promotions.length === 0) return;
+
+  try {
+    const response = await fetch(`${REVALIDATE_BASE_URL}/api/revalidate`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${process.env.API_SECRET_KEY}`,
+      },
+      body: JSON.stringify({
+        promotions: promotions.map(({ shortId, storeName }) => ({ shortId, storeName })),
+      }),
+    });
+
+    if (!response.ok) {
+      throw new Error(`${response.status} ${response.statusText}`);
+    }
+    console.log(`🔄 Cache invalidated for ${promotions.length} promotions`);
+  } catch (error) {
+    console.error(`⚠️ Could not invalidate the site cache (${error.message}). Pages keep the old image URL for up to 1 hour.`);
+  }
+}
+
+function formatKB(bytes) {
+  return `${(bytes / 1024).toFixed(1)}KB`;
+}
+
+async function main() {
+  const { PrismaClient } = require('@prisma/client');
+  const prisma = new PrismaClient();
+
+  try {
+    const options = parseArgs(process.argv.slice(2));
+    console.log('🚀 Starting batch image optimization...');
+    console.log(`Mode: ${options.force ? 'force' : options.incremental ? 'incremental' : 'content-hash'} | Workers: ${options.workers}`);
+
+    if (!existsSync(OUTPUT_DIR)) {
+      await fs.mkdir(OUTPUT_DIR, { recursive: true });
+    }
+
+    const manifest = await loadManifest();
+    const runStartedAt = new Date().toISOString();
+    const { jobs, alreadyOptimized, skipped } = await collectJobs(prisma, manifest, options);
+    console.log(`Found ${jobs.length} images to check (${alreadyOptimized.length} already optimized, ${skipped} skipped)`);
+
+    // Promoções com imagem otimizada por pipelines anteriores: só atualiza o banco
+    for (const promotion of alreadyOptimized) {
+      await prisma.promotion.update({
+        where: { id: promotion.id },
+        data: { imageUrl: `${PUBLIC_BASE_URL}/images/products/${outputFilesFor(promotion.shortId).web}` },
+      });
+    }
+
+    const startedAt = Date.now();
+    const jobsByShortId = new Map(jobs.map((job) => [job.shortId, job]));
+    const optimized = [];
+    let unchanged = 0;
+    let errors = 0;
+    let totalSourceBytes = 0;
+    let totalOutputBytes = 0;
+
+    await runPool(jobs, options.workers, (message) => {
+      if (!message.success) {
+        errors++;
+        console.error(`❌ Error processing ${message.shortId}: ${message.error}`);
+        return;
+      }
+
+      const { result } = message;
+      if (result.unchanged) {
+        unchanged++;
+        return;
+      }
+
+      const webBytes = result.outputs.web.bytes;
+      totalSourceBytes += result.sourceBytes;
+      totalOutputBytes += webBytes;
+      optimized.push(result);
+
+      manifest.images[result.shortId] = {
+        sourceUrl: result.sourceUrl,
+        hash: result.hash,
+        sourceBytes: result.sourceBytes,
+        outputs: result.outputs,
+        processedAt: new Date().toISOString(),
+      };
+
+      console.log(
+        `✅ ${result.shortId}: ${formatKB(result.sourceBytes)} -> web ${formatKB(webBytes)}, ` +
+        `whatsapp ${formatKB(result.outputs.whatsapp.bytes)} ` +
+        `(saved ${formatKB(result.sourceBytes - webBytes)}, ${result.durationMs}ms)`
+      );
+    });
+
+    // Apontar as promoções para a imagem otimizada servida pelo site
+    for (const result of optimized) {
+      await prisma.promotion.update({
+        where: { id: jobsByShortId.get(result.shortId).id },
+        data: { imageUrl: `${PUBLIC_BASE_URL}/images/products/${result.outputs.web.file}` },
+      });
+    }
+
+    await revalidatePromotions([
+      ...alreadyOptimized,
+      ...optimized.map((result) => jobsByShortId.get(result.shortId)),
+    ]);
+
+    manifest.lastRunAt = runStartedAt;
+    await saveManifest(manifest);
+
+    console.log('\n📊 Processing Summary:');
+    console.log(`✅ Processed: ${optimized.length}`);
+    console.log(`📁 Database Updated (already optimized): ${alreadyOptimized.length}`);
+    console.log(`⏭️ Unchanged: ${unchanged + skipped}`);
+    console.log(`❌ Errors: ${errors}`);
+    console.log(`💾 Bytes saved (web variant): ${formatKB(totalSourceBytes - totalOutputBytes)}`);
+    console.log(`⏱️ Total time: ${Date.now() - startedAt}ms`);
+  } catch (error) {
+    console.error('Fatal error:', error);
+    process.exitCode = 1;
+  } finally {
+    await prisma.$disconnect();
+  }
+}
+
+if (isMainThread && require.main === module) {
+  main();
+}
+
+module.exports = { optimizePromotionImage, VARIANTS };
@@ -2,6 +2,7 @@ import time
 import pandas as pd
 import os
 import asyncio
+import subprocess
 import random
 import requests
 from selenium import webdriver
@@ -17,6 +18,8 @@ from logging.handlers import TimedRotatingFileHandler
 from selenium.webdriver.common.action_chains import ActionChains
 from datetime import datetime, timedelta, timezone
 import json
+import sys
+from enum import Enum
 
 # ==============================================================================
 # --- CONSTANTS ---
@@ -32,6 +35,17 @@ CHROME_PROFILE_PATH = os.path.join(BASE_FOLDER3, "ChromeProfile")
 EXCLUDE_FILE = "gafanhoto.xlsx"
 CHROMEDRIVER_PATH = r'C:\Users\Nilton\Desktop\Chromedriver\chromedriver-win64\chromedriver.exe'
 MESSAGE_BOX_XPATH = '//div[@contenteditable="true"][@data-tab="10"]'
+SEARCH_BOX_XPATH = "//div[@contenteditable='true'][@data-tab='3']"
+WHATSAPP_WEB_URL = "https://web.whatsapp.com"
+
+# Persistent browser (sidecar) configuration
+# When enabled, Chrome runs as a long-lived process with remote debugging and the
+# script attaches to it instead of launching a new browser on every restart.
+USE_PERSISTENT_BROWSER = True
+CHROME_BINARY_PATH = r'C:\Program Files\Google\Chrome\Application\chrome.exe'
+CHROME_DEBUG_HOST = "127.0.0.1"
+CHROME_DEBUG_PORT = 9222
+CHROME_DEBUGGER_ADDRESS = f"{CHROME_DEBUG_HOST}:{CHROME_DEBUG_PORT}"
 
 # API Configuration
 API_BASE_URL = "http://localhost:3000"
@@ -58,6 +72,31 @@ FILE_TO_GROUP_MAPPING = {
     "pechinchou-bebidas.xlsx": ["Fareja.ai - Bebidas #55", "Fareja.ai - Supermercado #71"]
 }
 
+# ==============================================================================
+# --- WHATSAPP MESSAGE TEMPLATES ---
+# ==============================================================================
+# Templates are compiled once per store at startup. Fields available:
+# {header} {footer} {store_label} (filled at compile time) and
+# {title} {de_line} {price} {cupom_line} {link} (filled per deal).
+# To add a variant, append a template to DEFAULT_MESSAGE_TEMPLATES or add a
+# store-specific list to STORE_MESSAGE_TEMPLATES; one variant is picked per deal.
+MESSAGE_HEADER = "🚨*Farejei outra Promo!*🚨\n"
+MESSAGE_FOOTER = (
+    "\n*🟢 Link do Grupo Whats:"
+    "\nhttps://chat.whatsapp.com/EIrN3j3ndMH6SV3pCWDfJz"
+    "\n*🌎 Site c/ tds as Promos*"
+    "\nhttps://fareja.ai"
+    "\n*📷 Instagram*"
+    "\nhttps://www.instagram.com/fareja.ai/"
+)
+DEFAULT_MESSAGE_TEMPLATES = [
+    "{header}{title}\n{de_line}\n🔥 *Por: R$ {price}*\n{cupom_line}"
+    "🛒 *Link:* {link}\n🛍️ *Loja:* {store_label}\n{footer}",
+]
+STORE_MESSAGE_TEMPLATES = {
+    # "AMAZON": ["..."],
+}
+
 # ==============================================================================
 # --- SETUP LOGGING ---
 # ==============================================================================
@@ -132,52 +171,161 @@ def is_recent_scrape(scrap_date):
         logger.error(f"Error checking scrap date: {e}")
         return False
 
-def create_whatsapp_message(row):
-    """Creates a WhatsApp message based on the row data."""
-    message = "🚨*Farejei outra Promo!*🚨\n"
-
-    title = row.get('TITLE', 'N/A')
-    message += f"{title}\n"
+# ==============================================================================
+# --- MESSAGE RENDERING ---
+# ==============================================================================
+class Store(Enum):
+    AMAZON = "Amazon"
+    MERCADO_LIVRE = "Mercado Livre"
+    MAGALU = "Magalu"
+    OTHER = "Outra Loja"
+    UNKNOWN = "Desconhecida"
+
+# Placeholder kept in pre-rendered messages until the final link is known
+LINK_PLACEHOLDER = "\x00FINAL_LINK\x00"
+
+# Pre-rendered messages by deal key, only for deals still in the queue
+RENDERED_MESSAGE_CACHE = {}
+
+class _KeepMissingFields(dict):
+    """Leave unknown template fields untouched so they can be filled later"""
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+def compile_message_templates():
+    """Fill the static parts of every template once per store"""
+    compiled = {}
+    for store in Store:
+        templates = STORE_MESSAGE_TEMPLATES.get(store.name, DEFAULT_MESSAGE_TEMPLATES)
+        compiled[store] = [
+            template.format_map(_KeepMissingFields(
+                header=MESSAGE_HEADER,
+                footer=MESSAGE_FOOTER,
+                store_label=store.value,
+            ))
+            for template in templates
+        ]
+    return compiled
+
+COMPILED_MESSAGE_TEMPLATES = compile_message_templates()
+
+def is_empty_value(value):
+    """Check if a spreadsheet cell is empty (None, NaN or blank string)"""
+    return value is None or pd.isna(value) or str(value).strip() == '' or str(value).lower() == 'nan'
+
+def classify_store(store, link):
+    """Classify the store from the STORE column and the affiliate link"""
+    store = store.lower()
+    link = link.lower()
+    if 'amazon' in store or 'amazon' in link:
+        return Store.AMAZON
+    if 'mercado' in store or 'mercadolivre' in link:
+        return Store.MERCADO_LIVRE
+    if 'magazinevoce' in link:
+        return Store.MAGALU
+    return Store.OTHER
+
+def get_deal_key(row):
+    """Unique key of a deal, same as the UNIQUE_KEY used for deduplication"""
+    return str(row.get('TITLE')) + str(row.get('SALE_DATE'))
+
+def render_message(row, link):
+    """Render a message from the compiled templates of the deal's store"""
+    if is_empty_value(link) or link == 'N/A':
+        link = 'N/A'
+        store = Store.UNKNOWN
+    else:
+        # Classify from values known before sending (the final link is a site
+        # link that only exists after the API call, so it never identifies the store)
+        store_name = row.get('STORE', '')
+        affiliate_link = row.get('Link', '')
+        store = classify_store(
+            '' if is_empty_value(store_name) else str(store_name),
+            '' if is_empty_value(affiliate_link) else str(affiliate_link),
+        )
 
-    # Handle DE_VALUE (send the value as is if it's not empty)
     de = row.get('DE', '')
-    if de and str(de).strip() != '' and str(de).lower() != 'nan':
-        de_formatted = format_price(de)
-        message += f"\n❌ ~De: R$ {de_formatted}~"
-
-    price = row.get('PRICE', 'N/A')
-    price_formatted = format_price(price)
-    message += f"\n🔥 *Por: R$ {price_formatted}*\n"
-
-    # Handle Cupom (only include the line if Cupom is not empty)
     cupom = row.get('Cupom', '')
-    if cupom and str(cupom).strip() != '' and str(cupom).lower() != 'nan':
-        message += f"🎟️ *Cupom: {cupom}*\n"
-
-    url4 = row.get('FINAL_LINK', 'N/A')
-    if pd.isna(url4) or url4 == 'nan' or url4 == 'N/A':
-        message += f"🛒 *Link:* N/A\n"
-        message += f"🛍️ *Loja:* Desconhecida\n"
-    else:
-        message += f"🛒 *Link:* {url4}\n"
-        store = row.get('STORE', '').lower()
-        if 'amazon' in store or 'amazon' in url4.lower():
-            message += f"🛍️ *Loja:* Amazon\n"
-        elif 'mercado' in store or 'mercadolivre' in url4.lower():
-            message += f"🛍️ *Loja:* Mercado Livre\n"
-        elif 'magazinevoce' in url4.lower():
-            message += f"🛍️ *Loja:* Magalu\n"
-        else:
-            message += f"🛍️ *Loja:* Outra Loja\n"
-
-    message += "\n*🟢 Link do Grupo Whats:"
-    message += "\nhttps://chat.whatsapp.com/EIrN3j3ndMH6SV3pCWDfJz"
-    message += "\n*🌎 Site c/ tds as Promos*"
-    message += "\nhttps://fareja.ai"
-    message += "\n*📷 Instagram*"
-    message += "\nhttps://www.instagram.com/fareja.ai/"
+    template = random.choice(COMPILED_MESSAGE_TEMPLATES[store])
+    return template.format(
+        title=row.get('TITLE', 'N/A'),
+        de_line='' if is_empty_value(de) else f"\n❌ ~De: R$ {format_price(de)}~",
+        price=format_price(row.get('PRICE', 'N/A')),
+        cupom_line='' if is_empty_value(cupom) else f"🎟️ *Cupom: {cupom}*\n",
+        link=link,
+    )
 
-    return message
+def create_whatsapp_message(row):
+    """Creates a WhatsApp message based on the row data."""
+    return render_message(row, row.get('FINAL_LINK', 'N/A'))
+
+def prerender_messages(deals_df):
+    """Render messages for a batch of queued deals up front, before their links exist"""
+    rows = deals_df.to_dict('records')
+    current_keys = {get_deal_key(row) for row in rows}
+
+    # Drop messages of deals that left the queue (sent elsewhere, removed or edited)
+    for key in RENDERED_MESSAGE_CACHE.keys() - current_keys:
+        del RENDERED_MESSAGE_CACHE[key]
+
+    rendered = 0
+    for row in rows:
+        key = get_deal_key(row)
+        if key not in RENDERED_MESSAGE_CACHE:
+            RENDERED_MESSAGE_CACHE[key] = render_message(row, LINK_PLACEHOLDER)
+            rendered += 1
+    return rendered
+
+def get_whatsapp_message(row, final_link):
+    """Return the cached message for a deal with its final link filled in"""
+    key = get_deal_key(row)
+    message = RENDERED_MESSAGE_CACHE.get(key)
+    if message is None:
+        message = render_message(row, LINK_PLACEHOLDER)
+        RENDERED_MESSAGE_CACHE[key] = message
+    return message.replace(LINK_PLACEHOLDER, final_link)
+
+def discard_cached_message(row):
+    """Drop a deal's cached message once it has been sent"""
+    RENDERED_MESSAGE_CACHE.pop(get_deal_key(row), None)
+
+def benchmark_message_rendering(deal_count=50000):
+    """Compare per-row rendering with batch pre-rendering over a synthetic queue"""
+    stores = ['Amazon', 'Mercado Livre', 'Magalu', 'Kabum']
+    deals_df = pd.DataFrame([
+        {
+            'TITLE': f"Produto de teste {i}",
+            'STORE': stores[i % len(stores)],
+            'Cupom': f"CUPOM{i}" if i % 3 == 0 else pd.NA,
+            'SALE_DATE': f"2024-01-01 00:{i % 60:02d}",
+            'DE': f"{i % 500 + 100},90" if i % 2 == 0 else pd.NA,
+            'PRICE': f"{i % 500 + 50},90",
+        }
+        for i in range(deal_count)
+    ])
+    final_link = "https://fareja.ai/p/abcdEFGH"
+
+    start = time.perf_counter()
+    for row in deals_df.to_dict('records'):
+        row['FINAL_LINK'] = final_link
+        create_whatsapp_message(row)
+    per_row_time = time.perf_counter() - start
+
+    RENDERED_MESSAGE_CACHE.clear()
+    start = time.perf_counter()
+    prerender_messages(deals_df)
+    prerender_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for row in deals_df.to_dict('records'):
+        get_whatsapp_message(row, final_link)
+    lookup_time = time.perf_counter() - start
+    RENDERED_MESSAGE_CACHE.clear()
+
+    logger.info(f"BENCHMARK: {deal_count} deals")
+    logger.info(f"BENCHMARK: Per-row rendering: {per_row_time:.3f}s ({per_row_time / deal_count * 1e6:.1f} us/deal)")
+    logger.info(f"BENCHMARK: Batch pre-rendering: {prerender_time:.3f}s ({prerender_time / deal_count * 1e6:.1f} us/deal)")
+    logger.info(f"BENCHMARK: Cached lookup at send time: {lookup_time:.3f}s ({lookup_time / deal_count * 1e6:.1f} us/deal)")
 
 # ==============================================================================
 # --- API INTEGRATION ---
@@ -226,8 +374,154 @@ def create_promotion_via_api(row):
 # ==============================================================================
 # --- WHATSAPP FUNCTIONS ---
 # ==============================================================================
+def wait_for_whatsapp_login(driver, timeout=30, interactive=True):
+    """Wait for the WhatsApp search box, asking for a QR scan if it does not show up"""
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.XPATH, SEARCH_BOX_XPATH))
+        )
+        logger.info("WHATSAPP INIT: WhatsApp session restored from Chrome profile. No QR scan needed.")
+        return True
+    except TimeoutException:
+        if not interactive:
+            # Unattended reattach: never block on input(), the caller retries later
+            logger.error("WHATSAPP INIT ERROR: WhatsApp Web is not logged in. Scan the QR code in the persistent Chrome.")
+            return False
+        logger.info("WHATSAPP INIT: Not logged in. Please scan the QR code to log into WhatsApp Web.")
+        input("Press Enter after logging into WhatsApp Web...")
+        logger.info("WHATSAPP INIT: WhatsApp Logged in successfully.")
+        return True
+
+def is_whatsapp_session_alive(driver):
+    """Check that the browser responds and WhatsApp Web is loaded and logged in"""
+    try:
+        if not driver.current_url.startswith(WHATSAPP_WEB_URL):
+            return False
+        return len(driver.find_elements(By.XPATH, SEARCH_BOX_XPATH)) > 0
+    except Exception:
+        return False
+
+def is_debugger_reachable():
+    """Check if a Chrome instance is listening on the remote debugging address"""
+    try:
+        response = requests.get(f"http://{CHROME_DEBUGGER_ADDRESS}/json/version", timeout=2)
+        return response.status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+def launch_persistent_chrome():
+    """Launch Chrome detached from this process with remote debugging enabled"""
+    logger.info(f"WHATSAPP INIT: Launching persistent Chrome on {CHROME_DEBUGGER_ADDRESS}...")
+    creationflags = 0
+    if os.name == 'nt':
+        creationflags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    subprocess.Popen(
+        [
+            CHROME_BINARY_PATH,
+            f"--remote-debugging-port={CHROME_DEBUG_PORT}",
+            f"--user-data-dir={CHROME_PROFILE_PATH}",
+            "--start-maximized",
+            WHATSAPP_WEB_URL,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        creationflags=creationflags,
+        close_fds=True,
+    )
+
+    # Wait for the debugging endpoint to come up
+    for _ in range(30):
+        if is_debugger_reachable():
+            return True
+        time.sleep(1)
+    logger.error("WHATSAPP INIT ERROR: Persistent Chrome did not expose the debugging port in time.")
+    return False
+
+def stop_persistent_chrome():
+    """Kill the persistent Chrome (the one using our debugging port) when it stops responding"""
+    logger.warning(f"WHATSAPP INIT: Stopping unresponsive persistent Chrome on {CHROME_DEBUGGER_ADDRESS}...")
+    port_flag = f"--remote-debugging-port={CHROME_DEBUG_PORT}"
+    try:
+        if os.name == 'nt':
+            subprocess.run(
+                [
+                    "powershell", "-NoProfile", "-Command",
+                    "Get-CimInstance Win32_Process -Filter \"name='chrome.exe'\" | "
+                    f"Where-Object {{ $_.CommandLine -like '*{port_flag}*' }} | "
+                    "ForEach-Object { Stop-Process -Id $_.ProcessId -Force }",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=30,
+            )
+        else:
+            subprocess.run(["pkill", "-f", "--", port_flag], timeout=30)
+    except Exception as e:
+        logger.error(f"WHATSAPP INIT ERROR: Failed to stop persistent Chrome: {e}")
+
+    # Wait for the debugging port to go down so the relaunch gets a fresh browser
+    for _ in range(10):
+        if not is_debugger_reachable():
+            return True
+        time.sleep(1)
+    return False
+
+def attach_to_persistent_chrome(interactive=True, allow_relaunch=True):
+    """Attach to the persistent Chrome, launching it only if it is not running"""
+    driver = None
+    try:
+        if is_debugger_reachable():
+            logger.info(f"WHATSAPP INIT: Found running Chrome on {CHROME_DEBUGGER_ADDRESS}. Attaching...")
+        elif not launch_persistent_chrome():
+            return None
+
+        options = Options()
+        options.add_experimental_option("debuggerAddress", CHROME_DEBUGGER_ADDRESS)
+        service = Service(CHROMEDRIVER_PATH)
+        driver = webdriver.Chrome(service=service, options=options)
+        # A stuck WhatsApp load must fail fast instead of waiting the 300 s default
+        driver.set_page_load_timeout(30)
+
+        # Reuse a tab that already has WhatsApp Web loaded, otherwise open a new one.
+        # A crashed renderer makes current_url raise, which triggers the relaunch below.
+        whatsapp_handle = None
+        for handle in driver.window_handles:
+            driver.switch_to.window(handle)
+            if driver.current_url.startswith(WHATSAPP_WEB_URL):
+                whatsapp_handle = handle
+                break
+
+        if whatsapp_handle is None:
+            driver.switch_to.new_window('tab')
+            driver.get(WHATSAPP_WEB_URL)
+        elif is_whatsapp_session_alive(driver):
+            logger.info("WHATSAPP INIT: Reusing loaded WhatsApp Web session.")
+            return driver
+        else:
+            # Tab exists but the session is dead ("use here", phone not connected, stuck load)
+            logger.warning("WHATSAPP INIT: WhatsApp tab is not usable. Reloading WhatsApp Web...")
+            driver.get(WHATSAPP_WEB_URL)
+
+        if not wait_for_whatsapp_login(driver, interactive=interactive):
+            driver.service.stop()
+            return None
+        return driver
+    except Exception as e:
+        logger.error(f"WHATSAPP INIT ERROR: Failed to attach to persistent Chrome: {e}", exc_info=True)
+        if driver:
+            close_whatsapp_driver(driver)
+        if not allow_relaunch:
+            return None
+
+        # The browser or the tab does not respond: relaunch Chrome once and attach again
+        stop_persistent_chrome()
+        return attach_to_persistent_chrome(interactive=interactive, allow_relaunch=False)
+
 def initialize_whatsapp_web():
     """Initialize WhatsApp Web with Chrome"""
+    if USE_PERSISTENT_BROWSER:
+        return attach_to_persistent_chrome()
+
     try:
         logger.info("WHATSAPP INIT: Initializing WhatsApp WebDriver...")
         options = Options()
@@ -237,29 +531,31 @@ def initialize_whatsapp_web():
         options.add_experimental_option('useAutomationExtension', False)
         service = Service(CHROMEDRIVER_PATH)
         driver = webdriver.Chrome(service=service, options=options)
-        driver.get("https://web.whatsapp.com")
-        
-        try:
-            WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.XPATH, "//div[@contenteditable='true'][@data-tab='3']"))
-            )
-            logger.info("WHATSAPP INIT: WhatsApp session restored from Chrome profile. No QR scan needed.")
-        except TimeoutException:
-            logger.info("WHATSAPP INIT: Not logged in. Please scan the QR code to log into WhatsApp Web.")
-            input("Press Enter after logging into WhatsApp Web...")
-            logger.info("WHATSAPP INIT: WhatsApp Logged in successfully.")
+        driver.get(WHATSAPP_WEB_URL)
+        wait_for_whatsapp_login(driver)
         return driver
     except Exception as e:
         logger.error(f"WHATSAPP INIT ERROR: Failed to initialize WhatsApp WebDriver: {e}", exc_info=True)
         return None
 
+def close_whatsapp_driver(driver):
+    """Close the WebDriver, leaving the persistent Chrome running for the next start"""
+    try:
+        if USE_PERSISTENT_BROWSER:
+            logger.info("MAIN: Detaching from persistent Chrome (browser stays open)...")
+            driver.service.stop()
+        else:
+            logger.info("MAIN: Closing WhatsApp WebDriver...")
+            driver.quit()
+    except Exception as e:
+        logger.error(f"MAIN ERROR: Failed to close WhatsApp WebDriver: {e}")
+
 def switch_chat_via_ui(driver, group_name):
     """Switch to a specific group chat"""
     try:
         logger.info(f"WHATSAPP CHAT: Switching to group '{group_name}'...")
-        search_box_xpath = "//div[@contenteditable='true'][@data-tab='3']"
         search_box = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, search_box_xpath))
+            EC.presence_of_element_located((By.XPATH, SEARCH_BOX_XPATH))
         )
         ActionChains(driver).move_to_element(search_box).click().key_down(Keys.CONTROL).send_keys("a").key_up(
             Keys.CONTROL).send_keys(Keys.BACK_SPACE).perform()
@@ -334,6 +630,11 @@ def send_message_to_groups(driver, message, target_groups):
     logger.info(f"WHATSAPP SUMMARY: Successfully sent to {success_count}/{len(target_groups)} groups")
     return success_count > 0
 
+class WhatsAppSession:
+    """Holds the current WebDriver so a reattach in the worker is visible to main()"""
+    def __init__(self, driver):
+        self.driver = driver
+
 # ==============================================================================
 # --- MAIN PROCESSING LOGIC ---
 # ==============================================================================
@@ -369,14 +670,28 @@ async def process_single_promotion(row):
         logger.error(f"PROMOTION ERROR: Error processing promotion: {e}", exc_info=True)
         return None
 
-async def file_processing_worker(driver):
+async def file_processing_worker(session):
     """Main file processing worker"""
     logger.info("FILE WORKER: Starting file processing worker...")
     
     while True:
         try:
             logger.info("--- FILE PROCESSING: Starting new iteration ---")
-            
+
+            # Reattach (and relaunch Chrome if needed) only when the session is dead
+            if USE_PERSISTENT_BROWSER and not is_whatsapp_session_alive(session.driver):
+                logger.warning("FILE WORKER: WhatsApp session is not alive. Reattaching to persistent Chrome...")
+                if session.driver:
+                    # Stop the old chromedriver before starting a new one
+                    close_whatsapp_driver(session.driver)
+                    session.driver = None
+                session.driver = await asyncio.to_thread(attach_to_persistent_chrome, False)
+                if not session.driver:
+                    logger.error("FILE WORKER: Reattach failed. Retrying in the next iteration.")
+                    await asyncio.sleep(5)
+                    continue
+            driver = session.driver
+
             for filename in os.listdir(FOLDER_SOURCE):
                 if not filename.endswith(".xlsx") or filename.startswith('~') or filename == EXCLUDE_FILE:
                     continue
@@ -458,6 +773,10 @@ async def file_processing_worker(driver):
                         
                         indices_to_remove = []
                         newly_processed = []
+
+                        # Render all messages of the batch up front (reused on retries)
+                        rendered_count = prerender_messages(deals_to_process)
+                        logger.info(f"MESSAGE RENDER: Pre-rendered {rendered_count} new messages")
                         
                         for index, row in deals_to_process.iterrows():
                             logger.info(f"DEAL PROCESSING: Processing '{row.get('TITLE', 'N/A')}'")
@@ -469,8 +788,8 @@ async def file_processing_worker(driver):
                                 processed_row['FINAL_LINK'] = final_link
                                 processed_row['DONE'] = 'YES'
                                 
-                                # Create WhatsApp message
-                                message = create_whatsapp_message(processed_row)
+                                # Get pre-rendered WhatsApp message
+                                message = get_whatsapp_message(processed_row, final_link)
                                 
                                 # Send to WhatsApp groups
                                 if send_message_to_groups(driver, message, target_groups):
@@ -478,6 +797,7 @@ async def file_processing_worker(driver):
                                     processed_row['DONE_WHATSAPP'] = 'YES'
                                     indices_to_remove.append(index)
                                     newly_processed.append(processed_row)
+                                    discard_cached_message(processed_row)
                                     logger.info(f"DEAL SUCCESS: '{row.get('TITLE', 'N/A')}' sent to WhatsApp groups")
                                 else:
                                     processed_row['FLAG'] = 'API_SUCCESS_WHATSAPP_FAIL'
@@ -521,32 +841,34 @@ async def file_processing_worker(driver):
 # ==============================================================================
 async def main():
     """Main function"""
-    whatsapp_driver = None
+    session = WhatsAppSession(None)
     try:
         logger.info("MAIN: Starting WhatsApp Promotions Script...")
         
         # Initialize WhatsApp
-        whatsapp_driver = initialize_whatsapp_web()
-        if not whatsapp_driver:
+        session.driver = initialize_whatsapp_web()
+        if not session.driver:
             logger.critical("MAIN ERROR: WhatsApp WebDriver failed to initialize. Exiting.")
             return
 
         logger.info("MAIN: WhatsApp WebDriver initialized successfully")
         
         # Start file processing worker
-        await file_processing_worker(whatsapp_driver)
+        await file_processing_worker(session)
 
     except Exception as e:
         logger.critical(f"MAIN CRITICAL ERROR: {e}", exc_info=True)
     finally:
-        if whatsapp_driver:
-            logger.info("MAIN: Closing WhatsApp WebDriver...")
-            whatsapp_driver.quit()
+        if session.driver:
+            close_whatsapp_driver(session.driver)
         logger.info("MAIN: Script terminated.")
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if "--benchmark" in sys.argv:
+            benchmark_message_rendering()
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("\nMAIN: Process interrupted by user.")
     finally: